@@ -3,6 +3,15 @@ Middleware for tracking page views.
 """
 
 import hashlib
+import logging
+import re
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Crawlers and link-preview fetchers that shouldn't count as readers
+_BOT_RE = re.compile(r'bot|spider|crawl|preview|facebookexternalhit|slurp', re.IGNORECASE)
 
 
 class PageViewMiddleware:
@@ -10,13 +19,21 @@ class PageViewMiddleware:
 
     def __init__(self, get_response):
         self.get_response = get_response
+        # Keyed hasher built once and copied per view, so IP hashes can't be
+        # reversed by hashing the (small) IPv4 address space.
+        key = hashlib.blake2b(settings.SECRET_KEY.encode(), digest_size=32).digest()
+        self._ip_hasher = hashlib.blake2b(key=key, digest_size=16)
 
     def __call__(self, request):
         response = self.get_response(request)
 
-        # Track views after successful response
+        # Track views after successful response, skipping HEAD/POST,
+        # HTMX fragment requests and bots before any other work
         if (
             response.status_code == 200
+            and request.method == 'GET'
+            and not getattr(request, 'htmx', False)
+            and not _BOT_RE.search(request.META.get('HTTP_USER_AGENT', ''))
             and hasattr(request, 'resolver_match')
             and request.resolver_match
             and request.resolver_match.url_name == 'post_detail'
@@ -27,29 +44,38 @@ class PageViewMiddleware:
         return response
 
     def _track_view(self, request):
-        """Record a page view for the post."""
-        from blog.models import Post
-        from analytics.models import PageView
+        """Record a page view for the post, via the Celery worker if there is one."""
+        from analytics.tasks import record_page_view, save_page_view
 
         slug = request.resolver_match.kwargs.get('slug')
         if not slug:
             return
 
-        try:
-            post = Post.objects.get(slug=slug)
-        except Post.DoesNotExist:
-            return
+        view = {
+            'referrer': request.META.get('HTTP_REFERER', '')[:500],
+            'user_agent': request.META.get('HTTP_USER_AGENT', '')[:500],
+            # Hash IP for privacy
+            'ip_hash': self._hash_ip(self._get_client_ip(request)),
+        }
 
-        # Hash IP for privacy
-        ip = self._get_client_ip(request)
-        ip_hash = hashlib.sha256(ip.encode()).hexdigest()[:32] if ip else ''
+        try:
+            if settings.PAGE_VIEWS_VIA_CELERY:
+                # Fail fast rather than hold the response while kombu retries
+                record_page_view.apply_async(args=(slug,), kwargs=view, retry=False)
+            else:
+                save_page_view(slug, **view)
+        except Exception as e:
+            # Analytics must never break page rendering
+            logger.warning(f"Failed to record page view for {slug}: {e}")
 
-        PageView.objects.create(
-            post=post,
-            referrer=request.META.get('HTTP_REFERER', '')[:500],
-            user_agent=request.META.get('HTTP_USER_AGENT', '')[:500],
-            ip_hash=ip_hash,
-        )
+    def _hash_ip(self, ip):
+        """Hash a client IP for privacy."""
+        ip_bytes = ip.encode('ascii', 'ignore')
+        if not ip_bytes:
+            return ''
+        hasher = self._ip_hasher.copy()
+        hasher.update(ip_bytes)
+        return hasher.hexdigest()
 
     def _get_client_ip(self, request):
         """Get client IP from request."""
@@ -3,6 +3,7 @@ Analytics models for tracking page views.
 """
 
 from django.db import models
+from django.utils import timezone
 
 
 class PageView(models.Model):
@@ -12,7 +13,8 @@ class PageView(models.Model):
         on_delete=models.CASCADE,
         related_name='page_views'
     )
-    viewed_at = models.DateTimeField(auto_now_add=True)
+    # Set when the view is recorded, not when its batch is written
+    viewed_at = models.DateTimeField(default=timezone.now, editable=False)
     referrer = models.URLField(max_length=500, blank=True)
     user_agent = models.CharField(max_length=500, blank=True)
     ip_hash = models.CharField(max_length=64, blank=True, help_text="Hashed IP for deduplication")
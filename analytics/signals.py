@@ -0,0 +1,16 @@
+"""
+Signal handlers keeping analytics caches in sync with blog posts.
+"""
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .tasks import post_id_cache_key
+
+
+@receiver([post_save, post_delete], sender='blog.Post')
+def forget_post_slug(sender, instance, **kwargs):
+    """Drop cached slug -> id entries for the post's current and loaded slug."""
+    slugs = {instance.slug, getattr(instance, '_loaded_values', {}).get('slug')}
+    cache.delete_many([post_id_cache_key(slug) for slug in slugs if slug])
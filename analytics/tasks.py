@@ -0,0 +1,142 @@
+"""
+Celery tasks for recording page views off the request path.
+"""
+
+import logging
+import threading
+from collections import Counter
+
+from celery import shared_task
+from celery.signals import worker_process_shutdown, worker_shutdown
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Case, F, Value, When
+
+logger = logging.getLogger(__name__)
+
+# Views are buffered per worker process and written with a single bulk INSERT
+# once the batch fills up or the oldest buffered view is FLUSH_INTERVAL old.
+# The age limit is enforced by a timer, so the tail of a burst still gets
+# written when no further views arrive.
+BATCH_SIZE = 50
+FLUSH_INTERVAL = 30  # seconds
+
+# Slug -> post id lookups are cached; analytics.signals drops stale entries
+POST_ID_CACHE_TIMEOUT = 60 * 60
+
+_buffer = []
+_buffer_lock = threading.Lock()
+_flush_timer = None
+
+
+def post_id_cache_key(slug: str) -> str:
+    return f'analytics:post_id:{slug}'
+
+
+def post_id_for_slug(slug: str) -> int | None:
+    """Return the id of the post with this slug, cached across views."""
+    from blog.models import Post
+
+    return cache.get_or_set(
+        post_id_cache_key(slug),
+        lambda: Post.objects.filter(slug=slug).values_list('id', flat=True).first(),
+        POST_ID_CACHE_TIMEOUT,
+    )
+
+
+def _page_view(slug: str, referrer: str, user_agent: str, ip_hash: str):
+    """Build an unsaved PageView for the post with this slug, or None."""
+    from analytics.models import PageView
+
+    post_id = post_id_for_slug(slug)
+    if post_id is None:
+        return None
+
+    return PageView(
+        post_id=post_id,
+        referrer=referrer[:500],
+        user_agent=user_agent[:500],
+        ip_hash=ip_hash,
+    )
+
+
+@shared_task(ignore_result=True)
+def record_page_view(slug: str, referrer: str = '', user_agent: str = '', ip_hash: str = ''):
+    """
+    Buffer a page view for the post with the given slug.
+
+    Args:
+        slug: Slug of the viewed post
+        referrer: HTTP referrer (truncated to 500 chars)
+        user_agent: Client user agent (truncated to 500 chars)
+        ip_hash: Hashed client IP
+    """
+    view = _page_view(slug, referrer, user_agent, ip_hash)
+    if view is None:
+        return
+
+    global _flush_timer
+    with _buffer_lock:
+        _buffer.append(view)
+        due = len(_buffer) >= BATCH_SIZE
+        if not due and _flush_timer is None:
+            _flush_timer = threading.Timer(FLUSH_INTERVAL, _flush_from_timer)
+            _flush_timer.daemon = True
+            _flush_timer.start()
+
+    if due:
+        flush_page_views()
+
+
+def save_page_view(slug: str, referrer: str = '', user_agent: str = '', ip_hash: str = ''):
+    """Write a page view immediately, for when there's no worker to buffer it."""
+    view = _page_view(slug, referrer, user_agent, ip_hash)
+    if view is not None:
+        _write_page_views([view])
+
+
+def flush_page_views():
+    """Write all buffered page views and update post view counts."""
+    global _flush_timer
+    with _buffer_lock:
+        views = _buffer[:]
+        _buffer.clear()
+        if _flush_timer is not None:
+            _flush_timer.cancel()
+            _flush_timer = None
+
+    if views:
+        _write_page_views(views)
+
+
+def _write_page_views(views):
+    from analytics.models import PageView
+    from blog.models import Post
+
+    # Bump each post's denormalized view_count in the same transaction
+    counts = Counter(view.post_id for view in views)
+
+    try:
+        with transaction.atomic():
+            PageView.objects.bulk_create(views, batch_size=500)
+            Post.objects.filter(pk__in=counts).update(
+                view_count=F('view_count') + Case(
+                    *[When(pk=pk, then=Value(n)) for pk, n in counts.items()]
+                )
+            )
+    except Exception as e:
+        logger.error(f"Failed to record {len(views)} page views: {e}")
+
+
+def _flush_from_timer():
+    try:
+        flush_page_views()
+    finally:
+        # The timer thread opened its own connection; don't leak it
+        connection.close()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _flush_on_shutdown(**kwargs):
+    flush_page_views()
@@ -3,11 +3,24 @@ Django admin configuration for blog models.
 """
 
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.db.models import Count
 from django.utils.html import format_html
 
 from .models import Comment, Image, Post, Profile, Tag
 
 
+class OptionalSlugMixin:
+    """Let the slug be left blank; the model's save() generates it."""
+
+    def formfield_for_dbfield(self, db_field, request, **kwargs):
+        formfield = super().formfield_for_dbfield(db_field, request, **kwargs)
+        if db_field.name == 'slug':
+            formfield.required = False
+            formfield.help_text = 'Leave blank to generate it on save.'
+        return formfield
+
+
 @admin.register(Profile)
 class ProfileAdmin(admin.ModelAdmin):
     list_display = ('user', 'bio_preview')
@@ -19,14 +32,9 @@ class ProfileAdmin(admin.ModelAdmin):
 
 
 @admin.register(Tag)
-class TagAdmin(admin.ModelAdmin):
+class TagAdmin(OptionalSlugMixin, admin.ModelAdmin):
     list_display = ('name', 'slug', 'post_count', 'wp_term_id')
     search_fields = ('name', 'slug')
-    prepopulated_fields = {'slug': ('name',)}
-
-    def post_count(self, obj):
-        return obj.posts.count()
-    post_count.short_description = 'Posts'
 
 
 @admin.register(Image)
@@ -67,12 +75,20 @@ class CommentInline(admin.TabularInline):
     readonly_fields = ('created_at',)
 
 
+class PostChangeList(ChangeList):
+    """Post changelist that skips the large content columns."""
+
+    def get_queryset(self, request, *args, **kwargs):
+        # Deferred here rather than in PostAdmin.get_queryset, which the
+        # change form also uses and which needs the content
+        return super().get_queryset(request, *args, **kwargs).defer('content_md', 'content_html')
+
+
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(OptionalSlugMixin, admin.ModelAdmin):
     list_display = ('title', 'author', 'status', 'published_at', 'tag_list', 'comment_count')
     list_filter = ('status', 'author', 'tags', 'created_at')
     search_fields = ('title', 'slug', 'content_md', 'excerpt')
-    prepopulated_fields = {'slug': ('title',)}
     filter_horizontal = ('tags',)
     date_hierarchy = 'published_at'
     inlines = [CommentInline]
@@ -97,13 +113,23 @@ class PostAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            _comment_count=Count('comments')
+        ).prefetch_related('tags')
+
+    def get_changelist(self, request, **kwargs):
+        return PostChangeList
+
     def tag_list(self, obj):
-        return ', '.join([tag.name for tag in obj.tags.all()[:3]])
+        # Slice in Python so the prefetched tags are used
+        return ', '.join([tag.name for tag in list(obj.tags.all())[:3]])
     tag_list.short_description = 'Tags'
 
     def comment_count(self, obj):
-        return obj.comments.count()
+        return obj._comment_count
     comment_count.short_description = 'Comments'
+    comment_count.admin_order_field = '_comment_count'
 
 
 @admin.register(Comment)
@@ -2,26 +2,33 @@
 Context processors for the blog app.
 """
 
-from django.db.models import Count, Q
+from django.core.cache import cache
 
 from .models import Post, PostStatus, Tag
 
+# Sidebar data is global and changes rarely; blog.signals clears it on edits
+SIDEBAR_CACHE_KEY = 'blog:sidebar'
+SIDEBAR_CACHE_TIMEOUT = 300
+
 
 def sidebar_context(request):
     """Add sidebar data to all templates."""
-    # Recent posts
-    recent_posts = Post.objects.filter(
-        status=PostStatus.PUBLISHED
-    ).select_related('featured_image').only(
-        'title', 'slug', 'published_at', 'featured_image'
-    )[:5]
-
-    # Tags with post counts
-    tags = Tag.objects.annotate(
-        post_count=Count('posts', filter=Q(posts__status=PostStatus.PUBLISHED))
-    ).filter(post_count__gt=0).order_by('-post_count')[:15]
-
-    return {
-        'sidebar_recent_posts': recent_posts,
-        'sidebar_tags': tags,
-    }
+    data = cache.get(SIDEBAR_CACHE_KEY)
+    if data is None:
+        # Recent posts
+        recent_posts = Post.objects.filter(
+            status=PostStatus.PUBLISHED
+        ).select_related('featured_image').only(
+            'title', 'slug', 'published_at', 'featured_image'
+        )[:5]
+
+        # Tags with post counts
+        tags = Tag.objects.filter(post_count__gt=0).order_by('-post_count')[:15]
+
+        data = {
+            'sidebar_recent_posts': list(recent_posts),
+            'sidebar_tags': list(tags),
+        }
+        cache.set(SIDEBAR_CACHE_KEY, data, SIDEBAR_CACHE_TIMEOUT)
+
+    return data
@@ -14,8 +14,12 @@ class LatestPostsFeed(Feed):
     description = "Latest posts from ChrisB Blog"
 
     def items(self):
+        # Only the columns the item_* methods read; skips content_md entirely
         return Post.objects.filter(
             status=PostStatus.PUBLISHED
+        ).select_related('author').only(
+            'title', 'slug', 'excerpt', 'content_html', 'published_at',
+            'author__username', 'author__first_name', 'author__last_name'
         ).order_by('-published_at')[:10]
 
     def item_title(self, item):
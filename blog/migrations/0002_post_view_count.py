@@ -0,0 +1,28 @@
+# Generated by Django 5.2.10 on 2026-10-15 09:00
+
+from django.db import migrations, models
+
+
+def backfill_view_counts(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    PageView = apps.get_model('analytics', 'PageView')
+    counts = PageView.objects.values('post_id').annotate(n=models.Count('id'))
+    for row in counts.iterator():
+        Post.objects.filter(pk=row['post_id']).update(view_count=row['n'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+        ('blog', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='view_count',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False, help_text='Denormalized page view total, maintained by analytics'),
+        ),
+        migrations.RunPython(backfill_view_counts, migrations.RunPython.noop),
+    ]
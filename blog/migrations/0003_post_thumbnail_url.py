@@ -0,0 +1,54 @@
+# Generated by Django 5.2.10 on 2026-10-15 09:30
+
+import re
+
+from django.db import migrations, models
+
+# Frozen copy of blog.models' thumbnail extraction, so later changes there
+# don't alter what this migration does
+WP_UPLOADS_URL = 'https://chrisblanduk.wordpress.com/wp-content/uploads/'
+IMG_HTML_RE = re.compile(r'<img[^>]+src=["\']([^"\']+)["\']')
+IMG_MD_RE = re.compile(r'!\[[^\]]*\]\(([^)]+)\)')
+WP_CORRUPT_RE = re.compile(r'wordpress\.com.*?/uploads/(?:images/)?(\d{4}/\d{2}/[^)\s"\'<>]+)$')
+LOCAL_UPLOAD_RE = re.compile(r'/uploads/(?:images/)?(\d{4}/\d{2}/.+)')
+
+
+def normalize_image_url(url):
+    if not url:
+        return None
+    if url.startswith('http'):
+        match = WP_CORRUPT_RE.search(url)
+        return WP_UPLOADS_URL + match.group(1) if match else url
+    match = LOCAL_UPLOAD_RE.match(url)
+    if match:
+        return WP_UPLOADS_URL + match.group(1)
+    return url if not url.startswith('/uploads/') else None
+
+
+def extract_first_image(content_html, content_md):
+    match = IMG_HTML_RE.search(content_html or '') or IMG_MD_RE.search(content_md or '')
+    return normalize_image_url(match.group(1)) if match else None
+
+
+def backfill_thumbnails(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    posts = Post.objects.only('pk', 'content_html', 'content_md')
+    for post in posts.iterator():
+        post.thumbnail_url = extract_first_image(post.content_html, post.content_md) or ''
+        post.save(update_fields=['thumbnail_url'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_post_view_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='thumbnail_url',
+            field=models.URLField(blank=True, editable=False, help_text='First image in the content, extracted on save', max_length=500),
+        ),
+        migrations.RunPython(backfill_thumbnails, migrations.RunPython.noop),
+    ]
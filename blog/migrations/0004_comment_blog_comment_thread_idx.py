@@ -0,0 +1,17 @@
+# Generated by Django 5.2.10 on 2026-10-15 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_post_thumbnail_url'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['post', 'status', 'parent'], name='blog_comment_thread_idx'),
+        ),
+    ]
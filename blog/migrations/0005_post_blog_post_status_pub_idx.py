@@ -0,0 +1,17 @@
+# Generated by Django 5.2.10 on 2026-10-15 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_comment_blog_comment_thread_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['status', '-published_at'], name='blog_post_status_pub_idx'),
+        ),
+    ]
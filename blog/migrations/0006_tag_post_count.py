@@ -0,0 +1,28 @@
+# Generated by Django 5.2.10 on 2026-10-15 11:00
+
+from django.db import migrations, models
+
+
+def count_published_posts(apps, schema_editor):
+    Tag = apps.get_model('blog', 'Tag')
+    tags = Tag.objects.annotate(
+        n=models.Count('posts', filter=models.Q(posts__status='published'))
+    ).filter(n__gt=0)
+    for tag in tags:
+        Tag.objects.filter(pk=tag.pk).update(post_count=tag.n)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_post_blog_post_status_pub_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tag',
+            name='post_count',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False, help_text='Published posts with this tag, maintained by blog.signals'),
+        ),
+        migrations.RunPython(count_published_posts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.10 on 2026-10-15 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_tag_post_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='image',
+            name='thumbnail',
+            field=models.ImageField(blank=True, editable=False, help_text='WebP preview for image listings, generated on save', upload_to='images/thumbs/%Y/%m/'),
+        ),
+    ]
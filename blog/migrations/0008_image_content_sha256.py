@@ -0,0 +1,18 @@
+# Generated by Django 5.2.10 on 2026-10-15 12:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_image_thumbnail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='image',
+            name='content_sha256',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='SHA-256 of the file, used to spot duplicate uploads', max_length=64),
+        ),
+    ]
@@ -2,15 +2,151 @@
 Blog models: Post, Tag, Comment, Image, Profile.
 """
 
+import hashlib
+import importlib
+import io
+import os
+import re
+import threading
+from functools import cached_property
+
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
 from django.db import models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.html import strip_tags
 from django.utils.text import slugify
 
-import bleach
 import markdown
+from bleach.sanitizer import Cleaner
+
+# Sanitizer whitelist for rendered post HTML
+_ALLOWED_TAGS = frozenset({
+    'p', 'br', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'strong', 'em', 'u', 's', 'blockquote', 'code', 'pre',
+    'ul', 'ol', 'li', 'a', 'img', 'table', 'thead', 'tbody',
+    'tr', 'th', 'td', 'div', 'span', 'hr',
+    'sup', 'sub',  # For footnotes
+})
+_ALLOWED_ATTRIBUTES = {
+    'a': ['href', 'title', 'target', 'rel'],
+    'img': ['src', 'alt', 'title', 'width', 'height'],
+    'code': ['class'],
+    'pre': ['class'],
+    'div': ['class'],
+    'span': ['class'],
+    'th': ['colspan', 'rowspan'],
+    'td': ['colspan', 'rowspan'],
+}
+
+_WP_UPLOADS_URL = 'https://chrisblanduk.wordpress.com/wp-content/uploads/'
+
+# Content patterns used by thumbnail extraction and plain_excerpt
+_IMG_HTML_RE = re.compile(r'<img[^>]+src=["\']([^"\']+)["\']')
+_IMG_MD_RE = re.compile(r'!\[[^\]]*\]\(([^)]+)\)')
+# Corrupted URLs repeat the WordPress prefix; keep only the final upload path
+_WP_CORRUPT_RE = re.compile(r'wordpress\.com.*?/uploads/(?:images/)?(\d{4}/\d{2}/[^)\s"\'<>]+)$')
+_LOCAL_UPLOAD_RE = re.compile(r'/uploads/(?:images/)?(\d{4}/\d{2}/.+)')
+_WS_RE = re.compile(r'\s+')
+_MD_LINK_RE = re.compile(r'\[([^\]]+)\]\([^)]+\)')
+_MD_HEADER_RE = re.compile(r'^#+\s*', re.MULTILINE)
+_MD_BOLD_RE = re.compile(r'\*+([^*]+)\*+')
+
+
+def _resolve_markdown_extensions():
+    """Resolve MARKDOWN_EXTENSIONS names to (factory, config) pairs.
+
+    Done once at import so building a Markdown instance skips the
+    entry-point scan and module lookup for every extension. Instances are
+    still created per Markdown object, as extensions like footnotes and
+    toc keep per-document state on themselves.
+    """
+    configs = getattr(settings, 'MARKDOWN_EXTENSION_CONFIGS', {})
+    extensions = []
+    for name in getattr(settings, 'MARKDOWN_EXTENSIONS', []):
+        module_name, _, class_name = name.partition(':')
+        module = importlib.import_module(module_name)
+        factory = getattr(module, class_name) if class_name else module.makeExtension
+        extensions.append((factory, configs.get(name, {})))
+    return extensions
+
+
+_MARKDOWN_EXTENSIONS = _resolve_markdown_extensions()
+
+# Markdown and bleach parsers are stateful, so each gunicorn thread builds
+# its own pair once and reuses it for every render.
+_renderers = threading.local()
+
+
+def _markdown():
+    """Return this thread's Markdown instance, reset for a new document."""
+    md = getattr(_renderers, 'markdown', None)
+    if md is None:
+        md = _renderers.markdown = markdown.Markdown(
+            extensions=[factory(**config) for factory, config in _MARKDOWN_EXTENSIONS]
+        )
+    return md.reset()
+
+
+def markdown_to_html(text):
+    """Convert Markdown to (unsanitized) HTML with this thread's parser."""
+    return _markdown().convert(text)
+
+
+def _cleaner():
+    """Return this thread's bleach Cleaner."""
+    cleaner = getattr(_renderers, 'cleaner', None)
+    if cleaner is None:
+        cleaner = _renderers.cleaner = Cleaner(tags=_ALLOWED_TAGS, attributes=_ALLOWED_ATTRIBUTES)
+    return cleaner
+
+
+def _normalize_image_url(url):
+    """Convert local /uploads/ URLs to WordPress URLs.
+
+    Local files don't persist on Railway's ephemeral filesystem, and some
+    imported URLs carry repeated WordPress prefixes that need collapsing.
+    """
+    if not url:
+        return None
+    # Already a full URL (WordPress or other external)
+    if url.startswith('http'):
+        match = _WP_CORRUPT_RE.search(url)
+        return _WP_UPLOADS_URL + match.group(1) if match else url
+    # Local /uploads/YYYY/MM/file or /uploads/images/YYYY/MM/file
+    match = _LOCAL_UPLOAD_RE.match(url)
+    if match:
+        return _WP_UPLOADS_URL + match.group(1)
+    return url if not url.startswith('/uploads/') else None
+
+
+def extract_first_image(content_html, content_md):
+    """Extract first image URL from content for thumbnail display."""
+    # Try HTML content first, then fall back to markdown
+    match = _IMG_HTML_RE.search(content_html or '') or _IMG_MD_RE.search(content_md or '')
+    return _normalize_image_url(match.group(1)) if match else None
+
+
+def _unique_slug(model, base_slug, exclude_pk):
+    """Return base_slug, or base_slug-N with the lowest free N, in one query.
+
+    Names with no ASCII slug (e.g. "日本") fall back to the model name, so
+    they still get a routable slug like "tag-1" instead of "" or "-1".
+    """
+    base_slug = base_slug or model._meta.model_name
+    taken = set(
+        model.objects.filter(slug__startswith=base_slug).exclude(pk=exclude_pk).values_list('slug', flat=True)
+    )
+    slug = base_slug
+    counter = 1
+    while slug in taken:
+        slug = f"{base_slug}-{counter}"
+        counter += 1
+    return slug
 
 
 class Profile(models.Model):
@@ -28,6 +164,12 @@ class Tag(models.Model):
     name = models.CharField(max_length=100)
     slug = models.SlugField(max_length=100, unique=True)
     wp_term_id = models.PositiveIntegerField(null=True, blank=True, help_text="Original WordPress term ID")
+    post_count = models.PositiveIntegerField(
+        default=0,
+        db_index=True,
+        editable=False,
+        help_text="Published posts with this tag, maintained by blog.signals"
+    )
 
     class Meta:
         ordering = ['name']
@@ -37,16 +179,33 @@ class Tag(models.Model):
 
     def save(self, *args, **kwargs):
         if not self.slug:
-            self.slug = slugify(self.name)
+            self.slug = _unique_slug(Tag, slugify(self.name), self.pk)
         super().save(*args, **kwargs)
 
     def get_absolute_url(self):
         return reverse('blog:tag_detail', kwargs={'slug': self.slug})
 
+    @classmethod
+    def update_post_counts(cls, tag_ids):
+        """Recount published posts for the given tags in a single UPDATE."""
+        published = Post.tags.through.objects.filter(
+            tag_id=OuterRef('pk'),
+            post__status=PostStatus.PUBLISHED
+        ).values('tag_id').annotate(n=Count('post_id')).values('n')
+        cls.objects.filter(pk__in=tag_ids).update(post_count=Coalesce(Subquery(published), 0))
+
 
 class Image(models.Model):
     """Uploaded images for blog posts."""
+    THUMBNAIL_SIZE = (256, 256)
+
     file = models.ImageField(upload_to='images/%Y/%m/')
+    thumbnail = models.ImageField(
+        upload_to='images/thumbs/%Y/%m/',
+        blank=True,
+        editable=False,
+        help_text="WebP preview for image listings, generated on save"
+    )
     original_name = models.CharField(max_length=255, blank=True)
     alt_text = models.CharField(max_length=255, blank=True)
     caption = models.TextField(blank=True)
@@ -56,6 +215,13 @@ class Image(models.Model):
     uploaded_at = models.DateTimeField(auto_now_add=True)
     ai_generated = models.BooleanField(default=False)
     ai_prompt = models.TextField(blank=True, help_text="Prompt used for AI generation")
+    content_sha256 = models.CharField(
+        max_length=64,
+        blank=True,
+        db_index=True,
+        editable=False,
+        help_text="SHA-256 of the file, used to spot duplicate uploads"
+    )
 
     class Meta:
         ordering = ['-uploaded_at']
@@ -72,6 +238,8 @@ class Image(models.Model):
                 from PIL import Image as PILImage
                 img = PILImage.open(self.file)
                 self.width, self.height = img.size
+                if not self.thumbnail:
+                    self.thumbnail = self._make_thumbnail(img)
             except Exception:
                 pass
             # Get file size
@@ -79,8 +247,30 @@ class Image(models.Model):
                 self.size_bytes = self.file.size
             except Exception:
                 pass
+            # Hash contents for duplicate detection
+            if not self.content_sha256:
+                try:
+                    self.content_sha256 = self._hash_file()
+                except Exception:
+                    pass
         super().save(*args, **kwargs)
 
+    def _hash_file(self):
+        """SHA-256 hex digest of the file, read in chunks."""
+        digest = hashlib.sha256()
+        for chunk in self.file.chunks():
+            digest.update(chunk)
+        return digest.hexdigest()
+
+    def _make_thumbnail(self, img):
+        """Shrink an opened PIL image to a WebP listing thumbnail."""
+        thumb = img.convert('RGBA' if 'A' in img.getbands() or img.mode == 'P' else 'RGB')
+        thumb.thumbnail(self.THUMBNAIL_SIZE)
+        buffer = io.BytesIO()
+        thumb.save(buffer, format='WEBP', quality=80)
+        stem = os.path.splitext(os.path.basename(self.file.name))[0]
+        return ContentFile(buffer.getvalue(), name=f'{stem}.webp')
+
 
 class PostStatus(models.TextChoices):
     DRAFT = 'draft', 'Draft'
@@ -94,6 +284,12 @@ class Post(models.Model):
     slug = models.SlugField(max_length=255, unique=True)
     content_md = models.TextField(help_text="Content in Markdown format")
     content_html = models.TextField(blank=True, editable=False, help_text="Rendered HTML content")
+    thumbnail_url = models.URLField(
+        max_length=500,
+        blank=True,
+        editable=False,
+        help_text="First image in the content, extracted on save"
+    )
     excerpt = models.TextField(blank=True, help_text="Short summary for previews")
     status = models.CharField(
         max_length=20,
@@ -113,9 +309,19 @@ class Post(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     wp_post_id = models.PositiveIntegerField(null=True, blank=True, help_text="Original WordPress post ID")
+    view_count = models.PositiveIntegerField(
+        default=0,
+        db_index=True,
+        editable=False,
+        help_text="Denormalized page view total, maintained by analytics"
+    )
 
     class Meta:
         ordering = ['-published_at', '-created_at']
+        indexes = [
+            # Published-post listings: home, tag pages, feed, sidebar
+            models.Index(fields=['status', '-published_at'], name='blog_post_status_pub_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -123,49 +329,58 @@ class Post(models.Model):
     def save(self, *args, **kwargs):
         # Generate slug if not provided
         if not self.slug:
-            self.slug = slugify(self.title)
-            # Ensure uniqueness
-            base_slug = self.slug
-            counter = 1
-            while Post.objects.filter(slug=self.slug).exclude(pk=self.pk).exists():
-                self.slug = f"{base_slug}-{counter}"
-                counter += 1
-
-        # Convert Markdown to HTML
-        self.content_html = self._render_markdown()
+            self.slug = _unique_slug(Post, slugify(self.title), self.pk)
+
+        # Convert Markdown to HTML, but only when the content actually changed
+        update_fields = kwargs.get('update_fields')
+        content_changed = self._content_changed(update_fields)
+        if content_changed:
+            self.render_content()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'content_html', 'thumbnail_url'}
 
         # Set published_at when publishing
         if self.status == PostStatus.PUBLISHED and not self.published_at:
             self.published_at = timezone.now()
 
         super().save(*args, **kwargs)
+        # Saved values become the new baseline for change detection
+        deferred = self.get_deferred_fields()
+        self._loaded_values = {
+            **getattr(self, '_loaded_values', {}),
+            **{name: getattr(self, name) for name in ('content_md', 'slug', 'status') if name not in deferred},
+        }
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded values so save() can tell what changed
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def _content_changed(self, update_fields=None):
+        """Whether content_md needs re-rendering on this save."""
+        if update_fields is not None and 'content_md' not in update_fields:
+            return False
+        if 'content_md' in self.get_deferred_fields():
+            return False
+        loaded = getattr(self, '_loaded_values', {})
+        return not self.content_html or self.content_md != loaded.get('content_md')
+
+    def render_content(self):
+        """Render content_md into content_html and the thumbnail derived from it.
+
+        save() calls this when the content changes; bulk imports that bypass
+        save() call it directly.
+        """
+        self.content_html = self._render_markdown()
+        self.thumbnail_url = extract_first_image(self.content_html, self.content_md) or ''
+        self.__dict__.pop('first_image_url', None)
 
     def _render_markdown(self):
         """Render markdown content to sanitized HTML."""
-        md = markdown.Markdown(
-            extensions=getattr(settings, 'MARKDOWN_EXTENSIONS', []),
-            extension_configs=getattr(settings, 'MARKDOWN_EXTENSION_CONFIGS', {})
-        )
-        html = md.convert(self.content_md)
-        # Sanitize HTML
-        allowed_tags = [
-            'p', 'br', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
-            'strong', 'em', 'u', 's', 'blockquote', 'code', 'pre',
-            'ul', 'ol', 'li', 'a', 'img', 'table', 'thead', 'tbody',
-            'tr', 'th', 'td', 'div', 'span', 'hr',
-            'sup', 'sub',  # For footnotes
-        ]
-        allowed_attrs = {
-            'a': ['href', 'title', 'target', 'rel'],
-            'img': ['src', 'alt', 'title', 'width', 'height'],
-            'code': ['class'],
-            'pre': ['class'],
-            'div': ['class'],
-            'span': ['class'],
-            'th': ['colspan', 'rowspan'],
-            'td': ['colspan', 'rowspan'],
-        }
-        return bleach.clean(html, tags=allowed_tags, attributes=allowed_attrs)
+        html = markdown_to_html(self.content_md)
+        return _cleaner().clean(html)
 
     def get_absolute_url(self):
         return reverse('blog:post_detail', kwargs={'slug': self.slug})
@@ -174,52 +389,10 @@ class Post(models.Model):
     def is_published(self):
         return self.status == PostStatus.PUBLISHED and self.published_at and self.published_at <= timezone.now()
 
-    @property
+    @cached_property
     def first_image_url(self):
-        """Extract first image URL from content for thumbnail display.
-
-        Converts local /uploads/ URLs to WordPress URLs since local files
-        don't persist on Railway's ephemeral filesystem.
-        """
-        import re
-
-        def to_wordpress_url(url):
-            """Convert local /uploads/ URL to WordPress URL."""
-            if not url:
-                return None
-            # Already a full URL (WordPress or other external)
-            if url.startswith('http'):
-                # Fix corrupted URLs with repeated WordPress prefixes
-                if 'wordpress.com' in url:
-                    # Extract the final valid path
-                    match = re.search(r'/uploads/(?:images/)?(\d{4}/\d{2}/[^)\s"\'<>]+)$', url)
-                    if match:
-                        return f'https://chrisblanduk.wordpress.com/wp-content/uploads/{match.group(1)}'
-                return url
-            # Convert local /uploads/YYYY/MM/file or /uploads/images/YYYY/MM/file
-            match = re.match(r'/uploads/(?:images/)?(\d{4}/\d{2}/.+)', url)
-            if match:
-                return f'https://chrisblanduk.wordpress.com/wp-content/uploads/{match.group(1)}'
-            return url if not url.startswith('/uploads/') else None
-
-        # Try HTML content first - find first image
-        html_pattern = r'<img[^>]+src=["\']([^"\']+)["\']'
-        match = re.search(html_pattern, self.content_html or '')
-        if match:
-            return to_wordpress_url(match.group(1))
-
-        # Fall back to markdown - find first image
-        md_pattern = r'!\[[^\]]*\]\(([^)]+)\)'
-        match = re.search(md_pattern, self.content_md or '')
-        if match:
-            return to_wordpress_url(match.group(1))
-
-        return None
-
-    @property
-    def thumbnail_url(self):
-        """Get thumbnail URL from post content."""
-        return self.first_image_url
+        """First image URL in the current content (see extract_first_image)."""
+        return extract_first_image(self.content_html, self.content_md)
 
     @property
     def thumbnail_in_content(self):
@@ -231,9 +404,6 @@ class Post(models.Model):
     @property
     def plain_excerpt(self):
         """Get plain text excerpt without markdown/HTML formatting."""
-        import re
-        from django.utils.html import strip_tags
-
         # Use excerpt if available
         if self.excerpt:
             return self.excerpt
@@ -242,22 +412,22 @@ class Post(models.Model):
         if self.content_html:
             text = strip_tags(self.content_html)
             # Clean up whitespace
-            text = re.sub(r'\s+', ' ', text).strip()
+            text = _WS_RE.sub(' ', text).strip()
             return text
 
         # Fall back to content_md with markdown stripped
         if self.content_md:
             text = self.content_md
             # Remove images
-            text = re.sub(r'!\[[^\]]*\]\([^)]+\)', '', text)
+            text = _IMG_MD_RE.sub('', text)
             # Remove links but keep text
-            text = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', text)
+            text = _MD_LINK_RE.sub(r'\1', text)
             # Remove headers
-            text = re.sub(r'^#+\s*', '', text, flags=re.MULTILINE)
+            text = _MD_HEADER_RE.sub('', text)
             # Remove bold/italic
-            text = re.sub(r'\*+([^*]+)\*+', r'\1', text)
+            text = _MD_BOLD_RE.sub(r'\1', text)
             # Clean up whitespace
-            text = re.sub(r'\s+', ' ', text).strip()
+            text = _WS_RE.sub(' ', text).strip()
             return text
 
         return ''
@@ -292,6 +462,9 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['post', 'status', 'parent'], name='blog_comment_thread_idx'),
+        ]
 
     def __str__(self):
         return f"Comment by {self.author_name} on {self.post.title}"
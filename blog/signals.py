@@ -0,0 +1,65 @@
+"""
+Signal handlers for blog models.
+"""
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .context_processors import SIDEBAR_CACHE_KEY
+from .models import Image, Post, PostStatus, Tag
+
+
+@receiver([post_save, post_delete], sender=Post)
+@receiver([post_save, post_delete], sender=Tag)
+@receiver(m2m_changed, sender=Post.tags.through)
+def clear_sidebar_cache(sender, **kwargs):
+    """Drop the cached sidebar whenever posts or tags change."""
+    cache.delete(SIDEBAR_CACHE_KEY)
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def update_tag_counts_on_tagging(sender, instance, action, reverse, pk_set, **kwargs):
+    """Keep Tag.post_count current when tags are added to or removed from posts."""
+    if reverse:
+        # instance is a Tag; only its own count can change
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            Tag.update_post_counts([instance.pk])
+        return
+
+    if action == 'pre_clear':
+        instance._cleared_tag_ids = list(instance.tags.values_list('pk', flat=True))
+    elif action in ('post_add', 'post_remove'):
+        Tag.update_post_counts(pk_set)
+    elif action == 'post_clear':
+        Tag.update_post_counts(getattr(instance, '_cleared_tag_ids', []))
+
+
+@receiver(post_save, sender=Post)
+def update_tag_counts_on_status_change(sender, instance, created, **kwargs):
+    """Recount a post's tags when it moves into or out of published."""
+    loaded = getattr(instance, '_loaded_values', {})
+    if created or 'status' not in loaded or loaded['status'] == instance.status:
+        return
+    if PostStatus.PUBLISHED in (loaded['status'], instance.status):
+        Tag.update_post_counts(instance.tags.values_list('pk', flat=True))
+
+
+@receiver(pre_delete, sender=Post)
+def remember_deleted_post_tags(sender, instance, **kwargs):
+    # The M2M rows are gone by post_delete, so capture the tags first
+    instance._deleted_tag_ids = list(instance.tags.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Post)
+def update_tag_counts_on_delete(sender, instance, **kwargs):
+    Tag.update_post_counts(getattr(instance, '_deleted_tag_ids', []))
+
+
+@receiver(post_delete, sender=Image)
+def delete_image_file(sender, instance, **kwargs):
+    """Remove the stored files once the row's deletion has been committed."""
+    for field_file in (instance.file, instance.thumbnail):
+        if field_file:
+            transaction.on_commit(lambda f=field_file: f.delete(save=False))
@@ -4,7 +4,7 @@ Public blog views.
 
 from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
 from django.core.paginator import Paginator
-from django.db.models import Count, Q
+from django.db.models import Prefetch, Q
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, render
 from django.views.decorators.http import require_GET
@@ -32,22 +32,27 @@ def home(request):
 def post_detail(request, slug):
     """Single post view."""
     post = get_object_or_404(
-        Post.objects.select_related('author', 'featured_image').prefetch_related('tags'),
+        Post.objects.select_related('author', 'featured_image').prefetch_related('tags').defer('content_md'),
         slug=slug,
         status=PostStatus.PUBLISHED
     )
 
-    # Get approved comments with threading
+    # Get approved comments with threading; replies are filtered in SQL too
+    approved_replies = Prefetch(
+        'replies',
+        queryset=Comment.objects.filter(status=CommentStatus.APPROVED).order_by('created_at')
+    )
     comments = post.comments.filter(
         status=CommentStatus.APPROVED,
         parent__isnull=True
-    ).prefetch_related('replies')
+    ).prefetch_related(approved_replies)
 
-    # Get related posts (same tags)
+    # Get related posts (same tags); tag ids come from the prefetched tags
+    tag_ids = [tag.pk for tag in post.tags.all()]
     related_posts = Post.objects.filter(
         status=PostStatus.PUBLISHED,
-        tags__in=post.tags.all()
-    ).exclude(pk=post.pk).distinct()[:3]
+        tags__in=tag_ids
+    ).exclude(pk=post.pk).select_related('featured_image').prefetch_related('tags').distinct()[:3]
 
     return render(request, 'blog/post_detail.html', {
         'post': post,
@@ -58,9 +63,7 @@ def post_detail(request, slug):
 
 def tag_list(request):
     """List all tags with post counts."""
-    tags = Tag.objects.annotate(
-        post_count=Count('posts', filter=Q(posts__status=PostStatus.PUBLISHED))
-    ).filter(post_count__gt=0).order_by('name')
+    tags = Tag.objects.filter(post_count__gt=0).order_by('name')
 
     return render(request, 'blog/tag_list.html', {'tags': tags})
 
@@ -4,6 +4,7 @@ Django settings for chrisb_blog project.
 
 import os
 from pathlib import Path
+from urllib.parse import parse_qsl, unquote, urlparse
 
 from dotenv import load_dotenv
 
@@ -79,24 +80,24 @@ DATABASE_URL = os.environ.get('DATABASE_URL')
 
 if DATABASE_URL:
     # Parse DATABASE_URL for production (Railway)
-    import re
-    match = re.match(
-        r'postgres(?:ql)?://(?P<user>[^:]+):(?P<password>[^@]+)@(?P<host>[^:]+):(?P<port>\d+)/(?P<name>.+)',
-        DATABASE_URL
-    )
-    if match:
-        DATABASES = {
-            'default': {
-                'ENGINE': 'django.db.backends.postgresql',
-                'NAME': match.group('name'),
-                'USER': match.group('user'),
-                'PASSWORD': match.group('password'),
-                'HOST': match.group('host'),
-                'PORT': match.group('port'),
-            }
+    db_url = urlparse(DATABASE_URL)
+    if db_url.scheme not in ('postgres', 'postgresql') or not db_url.hostname:
+        raise ValueError(f"Invalid DATABASE_URL format: {db_url.scheme}://{db_url.hostname}")
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': unquote(db_url.path.lstrip('/')),
+            'USER': unquote(db_url.username or ''),
+            'PASSWORD': unquote(db_url.password or ''),
+            'HOST': db_url.hostname,
+            'PORT': str(db_url.port or 5432),
+            # Query parameters such as ?sslmode=require become connection options
+            'OPTIONS': dict(parse_qsl(db_url.query)),
+            # Reuse connections across requests instead of reconnecting
+            'CONN_MAX_AGE': int(os.environ.get('CONN_MAX_AGE', 600)),
+            'CONN_HEALTH_CHECKS': True,
         }
-    else:
-        raise ValueError(f"Invalid DATABASE_URL format: {DATABASE_URL}")
+    }
 else:
     # Development: Use SQLite
     DATABASES = {
@@ -110,21 +111,26 @@ else:
 # Redis and Caching
 REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
 
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
-        'LOCATION': REDIS_URL,
-    }
-} if os.environ.get('REDIS_URL') else {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-    }
-}
-
-# Session configuration
 if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            # Passed to redis-py's connection pool, shared with sessions
+            'OPTIONS': {
+                'max_connections': 50,
+                'socket_keepalive': True,
+            },
+        }
+    }
     SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
     SESSION_CACHE_ALIAS = 'default'
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
 
 
 # Celery Configuration
@@ -134,6 +140,14 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
+# Image generation tasks run for tens of seconds; ack them only once done and
+# don't let one worker reserve a queue of them while others sit idle
+CELERY_TASK_ACKS_LATE = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+
+# Page views are queued for the worker only when a broker is actually
+# configured; otherwise they're written during the request
+PAGE_VIEWS_VIA_CELERY = bool(os.environ.get('CELERY_BROKER_URL') or os.environ.get('REDIS_URL'))
 
 
 # Password validation
@@ -7,20 +7,23 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.contrib.sitemaps import GenericSitemap
 from django.contrib.sitemaps.views import sitemap
-from django.http import JsonResponse
+from django.http import HttpResponse
 from django.urls import include, path
+from django.views.decorators.cache import cache_page, never_cache
 
 from blog.feeds import LatestPostsFeed
 from blog.models import Post, PostStatus
 
 
+@never_cache
 def health_check(request):
     """Health check endpoint for Railway."""
-    return JsonResponse({'status': 'ok'})
+    # Polled every few seconds: touch no session, user or database
+    return HttpResponse('ok', content_type='text/plain')
 
 # Sitemap configuration
 post_info = {
-    'queryset': Post.objects.filter(status=PostStatus.PUBLISHED),
+    'queryset': Post.objects.filter(status=PostStatus.PUBLISHED).only('slug', 'published_at'),
     'date_field': 'published_at',
 }
 
@@ -34,10 +37,12 @@ urlpatterns = [
     path('editor/', include('editor.urls')),
     path('imagen/', include('imagen.urls')),
     path('feed/', LatestPostsFeed(), name='rss_feed'),
-    path('sitemap.xml', sitemap, {'sitemaps': sitemaps}, name='sitemap'),
+    path('sitemap.xml', cache_page(60 * 60)(sitemap), {'sitemaps': sitemaps}, name='sitemap'),
     path('', include('blog.urls')),
 ]
 
-# Serve media files (needed for user uploads and AI-generated images)
-# In production, consider using a CDN or cloud storage for better performance
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# Serve uploads and AI-generated images through Django in development only;
+# static() is a no-op without DEBUG, and production media belongs on a web
+# server or CDN in front of MEDIA_ROOT rather than on gunicorn workers
+if settings.DEBUG:
+    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
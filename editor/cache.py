@@ -0,0 +1,21 @@
+"""
+Cache keys and helpers for the editor dashboard.
+"""
+
+import uuid
+
+from django.core.cache import cache
+
+# Dashboard entries are keyed on this version; bumping it orphans them all
+DASHBOARD_VERSION_KEY = 'editor:dashboard:version'
+DASHBOARD_CACHE_TIMEOUT = 600
+
+
+def dashboard_version() -> str:
+    """Return the current dashboard cache version, creating one if needed."""
+    return cache.get_or_set(DASHBOARD_VERSION_KEY, lambda: uuid.uuid4().hex, None)
+
+
+def bump_dashboard_version():
+    """Invalidate every cached dashboard."""
+    cache.set(DASHBOARD_VERSION_KEY, uuid.uuid4().hex, None)
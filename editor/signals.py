@@ -0,0 +1,14 @@
+"""
+Signal handlers for the editor app.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import bump_dashboard_version
+
+
+@receiver([post_save, post_delete], sender='blog.Post')
+def invalidate_dashboards(sender, **kwargs):
+    """Invalidate every cached dashboard whenever a post changes."""
+    bump_dashboard_version()
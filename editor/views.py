@@ -4,27 +4,42 @@ Editor views for HTMX-powered post editing.
 
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
+from django.core.cache import cache
+from django.core.paginator import Paginator
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.utils.cache import patch_cache_control
 from django.views.decorators.http import require_http_methods, require_POST
 
-from blog.models import Image, Post, PostStatus, Tag
+from blog.models import Image, Post, PostStatus, Tag, markdown_to_html
 
+from .cache import DASHBOARD_CACHE_TIMEOUT, dashboard_version
 from .forms import ImageUploadForm, PostForm
 
+# Divisible by 2, 3, 4, 6 and 8, so the auto-fill .image-grid ends each page
+# on a full row at most widths (50 would leave a ragged last row)
+IMAGES_PER_PAGE = 48
+
 
 @login_required
 @staff_member_required
 def dashboard(request):
     """Editor dashboard with post list."""
-    posts = Post.objects.filter(author=request.user).select_related('featured_image')
-    drafts = posts.filter(status=PostStatus.DRAFT)
-    published = posts.filter(status=PostStatus.PUBLISHED)
-
-    return render(request, 'editor/dashboard.html', {
-        'drafts': drafts,
-        'published': published,
-    })
+    # editor.signals bumps the version on every post change
+    cache_key = f'editor:dashboard:{request.user.pk}:{dashboard_version()}'
+    context = cache.get(cache_key)
+    if context is None:
+        # One query for both lists, with only the columns the dashboard shows
+        posts = list(Post.objects.filter(author=request.user).only(
+            'id', 'title', 'slug', 'status', 'published_at', 'updated_at'
+        ))
+        context = {
+            'drafts': [post for post in posts if post.status == PostStatus.DRAFT],
+            'published': [post for post in posts if post.status == PostStatus.PUBLISHED],
+        }
+        cache.set(cache_key, context, DASHBOARD_CACHE_TIMEOUT)
+
+    return render(request, 'editor/dashboard.html', context)
 
 
 @login_required
@@ -80,17 +95,12 @@ def post_edit(request, pk):
 @require_POST
 def post_preview(request):
     """Preview markdown content as HTML."""
-    import markdown
-    from django.conf import settings
-
     content_md = request.POST.get('content', '')
-    md = markdown.Markdown(
-        extensions=getattr(settings, 'MARKDOWN_EXTENSIONS', []),
-        extension_configs=getattr(settings, 'MARKDOWN_EXTENSION_CONFIGS', {})
-    )
-    html = md.convert(content_md)
+    html = markdown_to_html(content_md)
 
-    return render(request, 'components/preview.html', {'content': html})
+    response = render(request, 'components/preview.html', {'content': html})
+    patch_cache_control(response, no_store=True)
+    return response
 
 
 @login_required
@@ -110,7 +120,11 @@ def post_delete(request, pk):
 @staff_member_required
 def image_manager(request):
     """Image management view."""
-    images = Image.objects.all()
+    paginator = Paginator(
+        Image.objects.only('id', 'file', 'thumbnail', 'alt_text', 'ai_generated'),
+        IMAGES_PER_PAGE
+    )
+    page_obj = paginator.get_page(request.GET.get('page'))
 
     if request.method == 'POST':
         form = ImageUploadForm(request.POST, request.FILES)
@@ -123,7 +137,8 @@ def image_manager(request):
         form = ImageUploadForm()
 
     return render(request, 'editor/image_manager.html', {
-        'images': images,
+        'images': page_obj,
+        'page_obj': page_obj,
         'form': form,
     })
 
@@ -134,7 +149,7 @@ def image_manager(request):
 def image_delete(request, pk):
     """Delete an image."""
     image = get_object_or_404(Image, pk=pk)
-    image.file.delete()
+    # blog.signals removes the file after the delete commits
     image.delete()
 
     if request.htmx:
@@ -146,20 +161,27 @@ def image_delete(request, pk):
 @staff_member_required
 def image_select(request, post_pk):
     """Select featured image for a post (HTMX modal)."""
-    post = get_object_or_404(Post, pk=post_pk, author=request.user)
-    images = Image.objects.all()
+    # Only the featured image changes here, so skip the post body
+    post = get_object_or_404(
+        Post.objects.defer('content_md', 'content_html'),
+        pk=post_pk,
+        author=request.user
+    )
+    paginator = Paginator(Image.objects.only('id', 'file', 'thumbnail', 'alt_text'), IMAGES_PER_PAGE)
+    page_obj = paginator.get_page(request.GET.get('page'))
 
     if request.method == 'POST':
         image_id = request.POST.get('image_id')
         if image_id:
             image = get_object_or_404(Image, pk=image_id)
             post.featured_image = image
-            post.save()
+            post.save(update_fields=['featured_image', 'updated_at'])
 
         if request.htmx:
             return render(request, 'components/featured_image.html', {'post': post})
 
     return render(request, 'components/image_select_modal.html', {
         'post': post,
-        'images': images,
+        'images': page_obj,
+        'page_obj': page_obj,
     })
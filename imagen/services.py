@@ -2,7 +2,7 @@
 Vertex AI Imagen 4 integration service.
 """
 
-import base64
+import functools
 import io
 import json
 import logging
@@ -11,12 +11,20 @@ from typing import Optional
 
 from django.conf import settings
 from django.core.files.base import ContentFile
+from django.utils.functional import cached_property
+from PIL import Image as PILImage
 
 logger = logging.getLogger(__name__)
 
+WEBP_QUALITY = 85
 
+
+@functools.lru_cache(maxsize=1)
 def get_google_credentials():
-    """Get Google Cloud credentials from environment variable or default."""
+    """Get Google Cloud credentials from environment variable or default.
+
+    Cached so the service-account JSON is parsed once per process.
+    """
     credentials_json = os.environ.get('GOOGLE_APPLICATION_CREDENTIALS_JSON')
 
     if credentials_json:
@@ -28,34 +36,42 @@ def get_google_credentials():
     return None
 
 
+@functools.lru_cache(maxsize=None)
+def get_generation_model(project_id, location):
+    """Get the Imagen model for a project and location.
+
+    Cached so every task in a worker process shares one model and its
+    underlying HTTP connection instead of re-initializing Vertex AI.
+    """
+    # vertexai stays a local import so web processes, which import the
+    # imagen tasks module, never load it
+    try:
+        import vertexai
+        from vertexai.preview.vision_models import ImageGenerationModel
+
+        credentials = get_google_credentials()
+        vertexai.init(
+            project=project_id,
+            location=location,
+            credentials=credentials
+        )
+        return ImageGenerationModel.from_pretrained("imagen-3.0-generate-001")
+    except Exception as e:
+        logger.error(f"Failed to initialize Vertex AI client: {e}")
+        raise
+
+
 class ImagenService:
     """Service for generating images using Google Vertex AI Imagen 4."""
 
     def __init__(self):
         self.project_id = settings.GOOGLE_CLOUD_PROJECT
         self.location = settings.VERTEX_AI_LOCATION
-        self._client = None
 
-    @property
+    @cached_property
     def client(self):
         """Lazy initialization of Vertex AI client."""
-        if self._client is None:
-            try:
-                import vertexai
-                from vertexai.preview.vision_models import ImageGenerationModel
-
-                credentials = get_google_credentials()
-                vertexai.init(
-                    project=self.project_id,
-                    location=self.location,
-                    credentials=credentials
-                )
-                self._client = ImageGenerationModel.from_pretrained("imagen-3.0-generate-001")
-            except Exception as e:
-                logger.error(f"Failed to initialize Vertex AI client: {e}")
-                raise
-
-        return self._client
+        return get_generation_model(self.project_id, self.location)
 
     def generate_image(
         self,
@@ -136,6 +152,9 @@ def create_image_from_bytes(image_bytes: bytes, filename: str, prompt: str = "")
     """
     Create an Image model instance from bytes.
 
+    The image is re-encoded as WebP, which is far smaller than the PNG
+    Imagen returns; the filename extension is changed to match.
+
     Args:
         image_bytes: Raw image bytes
         filename: Desired filename
@@ -146,7 +165,12 @@ def create_image_from_bytes(image_bytes: bytes, filename: str, prompt: str = "")
     """
     from blog.models import Image
 
-    content_file = ContentFile(image_bytes, name=filename)
+    buffer = io.BytesIO()
+    with PILImage.open(io.BytesIO(image_bytes)) as source:
+        source.save(buffer, format='WEBP', quality=WEBP_QUALITY, method=4)
+    filename = f"{os.path.splitext(filename)[0]}.webp"
+
+    content_file = ContentFile(buffer.getvalue(), name=filename)
 
     image = Image(
         file=content_file,
@@ -6,12 +6,19 @@ import logging
 import uuid
 
 from celery import shared_task
+from django.db import transaction
 
 logger = logging.getLogger(__name__)
 
 
-@shared_task(bind=True, max_retries=3)
-def generate_cover_image(self, post_id: int, custom_prompt: str = None):
+@shared_task(
+    autoretry_for=(Exception,),
+    max_retries=3,
+    retry_backoff=60,
+    retry_backoff_max=600,
+    retry_jitter=True,
+)
+def generate_cover_image(post_id: int, custom_prompt: str = None):
     """
     Generate a cover image for a blog post asynchronously.
 
@@ -23,7 +30,7 @@ def generate_cover_image(self, post_id: int, custom_prompt: str = None):
     from imagen.services import ImagenService, create_image_from_bytes
 
     try:
-        post = Post.objects.get(pk=post_id)
+        post = Post.objects.only('id', 'title', 'slug', 'excerpt', 'content_md', 'status', 'published_at').get(pk=post_id)
     except Post.DoesNotExist:
         logger.error(f"Post {post_id} not found")
         return
@@ -42,22 +49,28 @@ def generate_cover_image(self, post_id: int, custom_prompt: str = None):
                 filename,
                 prompt=f"Blog cover for: {prompt}"
             )
-            image.save()
-
-            # Set as featured image
-            post.featured_image = image
-            post.save(update_fields=['featured_image'])
+            # Image and featured image land in one commit
+            with transaction.atomic():
+                image.save()
+                post.featured_image = image
+                post.save(update_fields=['featured_image'])
 
             logger.info(f"Generated cover image for post {post_id}: {image.pk}")
             return image.pk
 
     except Exception as e:
         logger.error(f"Failed to generate cover for post {post_id}: {e}")
-        raise self.retry(exc=e, countdown=60)
+        raise
 
 
-@shared_task(bind=True, max_retries=3)
-def generate_custom_image(self, prompt: str, aspect_ratio: str = "16:9"):
+@shared_task(
+    autoretry_for=(Exception,),
+    max_retries=3,
+    retry_backoff=60,
+    retry_backoff_max=600,
+    retry_jitter=True,
+)
+def generate_custom_image(prompt: str, aspect_ratio: str = "16:9"):
     """
     Generate a custom image from a prompt.
 
@@ -88,4 +101,4 @@ def generate_custom_image(self, prompt: str, aspect_ratio: str = "16:9"):
 
     except Exception as e:
         logger.error(f"Failed to generate custom image: {e}")
-        raise self.retry(exc=e, countdown=60)
+        raise
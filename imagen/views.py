@@ -4,14 +4,19 @@ Imagen views for HTMX-powered image generation UI.
 
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
+from django.core.cache import cache
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, render
+from django.views.decorators.cache import cache_control
 from django.views.decorators.http import require_POST
 
 from blog.models import Image, Post
 
 from .tasks import generate_cover_image, generate_custom_image
 
+# The status fragment polls every 2s; a pending status is reused for that long
+TASK_STATUS_CACHE_TIMEOUT = 2
+
 
 @login_required
 @staff_member_required
@@ -69,35 +74,49 @@ def generate_custom(request):
 
 @login_required
 @staff_member_required
+@cache_control(max_age=TASK_STATUS_CACHE_TIMEOUT, private=True)
 def check_task(request, task_id):
     """Check the status of a generation task."""
+    cache_key = f'imagen:task:{task_id}'
+    status = cache.get(cache_key)
+    if status is None:
+        status = _task_status(task_id)
+        if not status['ready']:
+            cache.set(cache_key, status, TASK_STATUS_CACHE_TIMEOUT)
+
+    if request.htmx:
+        return render(request, 'components/task_status.html', status)
+
+    return JsonResponse(status)
+
+
+def _task_status(task_id):
+    from celery import states
     from celery.result import AsyncResult
 
-    result = AsyncResult(task_id)
+    # One backend read; AsyncResult's status/ready()/result each re-fetch
+    # the meta while the task is still pending
+    meta = AsyncResult(task_id).backend.get_task_meta(task_id)
 
     status = {
         'task_id': task_id,
-        'status': result.status,
-        'ready': result.ready(),
+        'status': meta['status'],
+        'ready': meta['status'] in states.READY_STATES,
     }
 
-    if result.ready():
-        if result.successful():
-            image_id = result.result
-            if image_id:
-                try:
-                    image = Image.objects.get(pk=image_id)
-                    status['image_id'] = image_id
-                    status['image_url'] = image.file.url
-                except Image.DoesNotExist:
-                    status['error'] = 'Image not found'
-        elif result.failed():
-            status['error'] = str(result.result)
-
-    if request.htmx:
-        return render(request, 'components/task_status.html', status)
-
-    return JsonResponse(status)
+    if meta['status'] == states.SUCCESS:
+        image_id = meta['result']
+        if image_id:
+            try:
+                image = Image.objects.only('file').get(pk=image_id)
+                status['image_id'] = image_id
+                status['image_url'] = image.file.url
+            except Image.DoesNotExist:
+                status['error'] = 'Image not found'
+    elif meta['status'] == states.FAILURE:
+        status['error'] = str(meta['result'])
+
+    return status
 
 
 @login_required
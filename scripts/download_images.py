@@ -15,10 +15,13 @@ import hashlib
 import os
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from tempfile import SpooledTemporaryFile
 from urllib.parse import urljoin, urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
 
 # Add project root to path
 project_root = Path(__file__).resolve().parent.parent
@@ -31,40 +34,56 @@ import django
 django.setup()
 
 from django.conf import settings
-from django.core.files.base import ContentFile
+from django.core.files import File
 
 from blog.models import Image, Post
 
+# Markdown images ![alt](url) or HTML images <img src="url">, in one scan
+IMG_RE = re.compile(r'!\[[^\]]*\]\((?P<md>[^)]+)\)|<img[^>]+src=["\'](?P<html>[^"\']+)["\']')
+
+DOWNLOAD_WORKERS = 16
+
+CHUNK_SIZE = 64 * 1024
+SPOOL_MAX_SIZE = 1024 * 1024
+
+# Shared keep-alive session: one TLS handshake per host, not per image
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=DOWNLOAD_WORKERS, pool_maxsize=DOWNLOAD_WORKERS)
+SESSION.mount('https://', _adapter)
+SESSION.mount('http://', _adapter)
+
 
 def extract_image_urls(content: str, domain: str) -> list[str]:
     """Extract image URLs from markdown/HTML content."""
     urls = set()
 
-    # Markdown images: ![alt](url)
-    md_pattern = r'!\[[^\]]*\]\(([^)]+)\)'
-    for match in re.finditer(md_pattern, content):
-        url = match.group(1)
-        if domain in url or url.startswith('/'):
-            urls.add(url)
-
-    # HTML images: <img src="url">
-    html_pattern = r'<img[^>]+src=["\']([^"\']+)["\']'
-    for match in re.finditer(html_pattern, content):
-        url = match.group(1)
+    for match in IMG_RE.finditer(content):
+        url = match.group('md') or match.group('html')
         if domain in url or url.startswith('/'):
             urls.add(url)
 
     return list(urls)
 
 
-def download_image(url: str, base_url: str) -> tuple[bytes, str] | None:
-    """Download image from URL and return bytes and filename."""
+def spool(chunks) -> tuple[SpooledTemporaryFile, str]:
+    """Copy chunks into a temp file that stays in memory up to 1 MB, hashing as it goes."""
+    spooled = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        digest.update(chunk)
+        spooled.write(chunk)
+    spooled.seek(0)
+    return spooled, digest.hexdigest()
+
+
+def download_image(url: str, base_url: str) -> tuple[SpooledTemporaryFile, str, str] | None:
+    """Download image from URL and return the spooled file, filename and SHA-256."""
     # Handle relative URLs
     if url.startswith('/'):
         url = urljoin(base_url, url)
 
     try:
-        response = requests.get(url, timeout=30, stream=True)
+        response = SESSION.get(url, timeout=30, stream=True)
         response.raise_for_status()
 
         # Get filename from URL
@@ -72,52 +91,72 @@ def download_image(url: str, base_url: str) -> tuple[bytes, str] | None:
         filename = os.path.basename(parsed.path)
         if not filename:
             # Generate filename from URL hash
-            url_hash = hashlib.md5(url.encode()).hexdigest()[:8]
+            url_hash = hashlib.blake2b(url.encode(), digest_size=4).hexdigest()
             content_type = response.headers.get('content-type', 'image/jpeg')
             ext = content_type.split('/')[-1].split(';')[0]
             filename = f"image-{url_hash}.{ext}"
 
-        return response.content, filename
+        image_file, content_sha256 = spool(response.iter_content(chunk_size=CHUNK_SIZE))
+        return image_file, filename, content_sha256
 
     except Exception as e:
         print(f"  Error downloading {url}: {e}")
         return None
 
 
-def process_post_images(post: Post, domain: str, base_url: str) -> int:
+def process_post_images(
+    post: Post,
+    domain: str,
+    base_url: str,
+    executor: ThreadPoolExecutor,
+    url_cache: dict[str, str],
+) -> int:
     """Download images from a post and update references."""
     downloaded = 0
-    new_content = post.content_md
+    replacements = {}
 
-    # Extract image URLs
-    image_urls = extract_image_urls(post.content_md, domain)
+    # Extract image URLs, reusing images already fetched earlier in this run
+    image_urls = []
+    for url in extract_image_urls(post.content_md, domain):
+        if url in url_cache:
+            replacements[url] = url_cache[url]
+        else:
+            image_urls.append(url)
 
-    for url in image_urls:
-        result = download_image(url, base_url)
+    # Download concurrently; saving stays on this thread, which owns the DB connection
+    results = executor.map(lambda url: download_image(url, base_url), image_urls)
+
+    for url, result in zip(image_urls, results):
         if result is None:
             continue
 
-        image_bytes, filename = result
-
-        # Create Image object
-        content_file = ContentFile(image_bytes, name=filename)
-        image = Image(
-            file=content_file,
-            original_name=filename,
-            alt_text=f"Image from {post.title}",
-        )
-        image.save()
-
-        # Update content with new URL
-        new_url = image.file.url
-        new_content = new_content.replace(url, new_url)
-        downloaded += 1
-        print(f"  Downloaded: {filename}")
-
-    # Save updated content if changed
-    if new_content != post.content_md:
-        post.content_md = new_content
-        post.save()
+        image_file, filename, content_sha256 = result
+
+        # Reuse an existing image with identical contents
+        image = Image.objects.filter(content_sha256=content_sha256).first()
+        if image:
+            print(f"  Duplicate of existing image: {image}")
+        else:
+            # Create Image object
+            content_file = File(image_file, name=filename)
+            image = Image(
+                file=content_file,
+                original_name=filename,
+                alt_text=f"Image from {post.title}",
+                content_sha256=content_sha256,
+            )
+            image.save()
+            downloaded += 1
+            print(f"  Downloaded: {filename}")
+        image_file.close()
+
+        replacements[url] = url_cache[url] = image.file.url
+
+    # Rewrite every downloaded URL in a single pass over the content
+    if replacements:
+        pattern = re.compile('|'.join(re.escape(url) for url in sorted(replacements, key=len, reverse=True)))
+        post.content_md = pattern.sub(lambda match: replacements[match.group(0)], post.content_md)
+        post.save(update_fields=['content_md'])
 
     return downloaded
 
@@ -135,12 +174,17 @@ def main():
     print(f"Base URL: {base_url}")
 
     total_downloaded = 0
-    posts = Post.objects.all()
-
-    for post in posts:
-        print(f"\nProcessing: {post.title}")
-        downloaded = process_post_images(post, domain, base_url)
-        total_downloaded += downloaded
+    url_cache = {}
+    # Stream posts with just what this script and Post.save() read
+    posts = Post.objects.only(
+        'id', 'title', 'slug', 'status', 'published_at', 'content_md', 'content_html'
+    ).iterator(chunk_size=100)
+
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+        for post in posts:
+            print(f"\nProcessing: {post.title}")
+            downloaded = process_post_images(post, domain, base_url, executor, url_cache)
+            total_downloaded += downloaded
 
     print(f"\n\nComplete! Downloaded {total_downloaded} images.")
 
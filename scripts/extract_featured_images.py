@@ -14,6 +14,7 @@ import os
 import re
 import sys
 from pathlib import Path
+from tempfile import SpooledTemporaryFile
 from urllib.parse import urljoin, urlparse
 
 import requests
@@ -29,30 +30,46 @@ import django
 django.setup()
 
 from django.conf import settings
-from django.core.files.base import ContentFile
+from django.core.files import File
 
 from blog.models import Image, Post
 
+# HTML images <img src="url"> or Markdown images ![alt](url)
+FIRST_IMG_RE = re.compile(r'<img[^>]+src=["\']([^"\']+)["\']|!\[[^\]]*\]\(([^)]+)\)')
+
+CHUNK_SIZE = 64 * 1024
+SPOOL_MAX_SIZE = 1024 * 1024
+
+# Shared keep-alive session: one TLS handshake per host, not per image
+SESSION = requests.Session()
+
 
 def extract_first_image_url(content: str) -> str | None:
     """Extract the first image URL from markdown/HTML content."""
-    # HTML images: <img src="url">
-    html_pattern = r'<img[^>]+src=["\']([^"\']+)["\']'
-    match = re.search(html_pattern, content)
-    if match:
-        return match.group(1)
-
-    # Markdown images: ![alt](url)
-    md_pattern = r'!\[[^\]]*\]\(([^)]+)\)'
-    match = re.search(md_pattern, content)
-    if match:
-        return match.group(1)
+    match = FIRST_IMG_RE.search(content)
+    return (match.group(1) or match.group(2)) if match else None
+
+
+def spool(chunks) -> tuple[SpooledTemporaryFile, str]:
+    """Copy chunks into a temp file that stays in memory up to 1 MB, hashing as it goes."""
+    spooled = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        digest.update(chunk)
+        spooled.write(chunk)
+    spooled.seek(0)
+    return spooled, digest.hexdigest()
 
-    return None
 
+def spool_path(path: Path) -> tuple[SpooledTemporaryFile, str, str]:
+    """Spool a local file the same way as a download."""
+    with path.open('rb') as f:
+        image_file, content_sha256 = spool(iter(lambda: f.read(CHUNK_SIZE), b''))
+    return image_file, path.name, content_sha256
 
-def download_image(url: str) -> tuple[bytes, str] | None:
-    """Download image from URL and return bytes and filename."""
+
+def download_image(url: str) -> tuple[SpooledTemporaryFile, str, str] | None:
+    """Download image from URL and return the spooled file, filename and SHA-256."""
     # Skip data URLs
     if url.startswith('data:'):
         return None
@@ -62,19 +79,17 @@ def download_image(url: str) -> tuple[bytes, str] | None:
         # Local file - read directly
         local_path = Path(settings.BASE_DIR) / url.lstrip('/')
         if local_path.exists():
-            filename = local_path.name
-            return local_path.read_bytes(), filename
+            return spool_path(local_path)
 
         # Try media root
         media_path = Path(settings.MEDIA_ROOT) / url.replace(settings.MEDIA_URL, '').lstrip('/')
         if media_path.exists():
-            filename = media_path.name
-            return media_path.read_bytes(), filename
+            return spool_path(media_path)
 
         return None
 
     try:
-        response = requests.get(url, timeout=30, stream=True)
+        response = SESSION.get(url, timeout=30, stream=True)
         response.raise_for_status()
 
         # Get filename from URL
@@ -82,36 +97,41 @@ def download_image(url: str) -> tuple[bytes, str] | None:
         filename = os.path.basename(parsed.path)
         if not filename:
             # Generate filename from URL hash
-            url_hash = hashlib.md5(url.encode()).hexdigest()[:8]
+            url_hash = hashlib.blake2b(url.encode(), digest_size=4).hexdigest()
             content_type = response.headers.get('content-type', 'image/jpeg')
             ext = content_type.split('/')[-1].split(';')[0]
             filename = f"image-{url_hash}.{ext}"
 
-        return response.content, filename
+        image_file, content_sha256 = spool(response.iter_content(chunk_size=CHUNK_SIZE))
+        return image_file, filename, content_sha256
 
     except Exception as e:
         print(f"  Error downloading {url}: {e}")
         return None
 
 
-def find_existing_image(url: str) -> Image | None:
+def load_images_by_name() -> dict[str, Image]:
+    """Map original names, then stored file names, to images in one query."""
+    by_original_name, by_file_name = {}, {}
+    # Oldest first, so the newest image wins a shared name
+    for image in Image.objects.only('id', 'original_name', 'file').order_by('uploaded_at').iterator():
+        by_file_name[os.path.basename(image.file.name)] = image
+        if image.original_name:
+            by_original_name[image.original_name] = image
+    return {**by_file_name, **by_original_name}
+
+
+def find_existing_image(url: str, images_by_name: dict[str, Image]) -> Image | None:
     """Check if an image already exists for this URL."""
     # Extract filename from URL
     parsed = urlparse(url)
     filename = os.path.basename(parsed.path)
     if filename:
-        # Check if an image with this filename exists
-        existing = Image.objects.filter(original_name=filename).first()
-        if existing:
-            return existing
-        # Also check by file path
-        existing = Image.objects.filter(file__icontains=filename).first()
-        if existing:
-            return existing
+        return images_by_name.get(filename)
     return None
 
 
-def process_post(post: Post) -> bool:
+def process_post(post: Post, url_cache: dict[str, Image], images_by_name: dict[str, Image]) -> bool:
     """Extract first image from post and set as featured image."""
     # Skip if already has featured image
     if post.featured_image:
@@ -130,9 +150,10 @@ def process_post(post: Post) -> bool:
     print(f"  Found image: {image_url}")
 
     # Check if image already exists
-    existing = find_existing_image(image_url)
+    existing = url_cache.get(image_url) or find_existing_image(image_url, images_by_name)
     if existing:
         print(f"  Using existing image: {existing}")
+        url_cache[image_url] = existing
         post.featured_image = existing
         post.save(update_fields=['featured_image'])
         return True
@@ -142,36 +163,49 @@ def process_post(post: Post) -> bool:
     if result is None:
         return False
 
-    image_bytes, filename = result
-
-    # Create Image object
-    content_file = ContentFile(image_bytes, name=filename)
-    image = Image(
-        file=content_file,
-        original_name=filename,
-        alt_text=f"Featured image for {post.title}",
-    )
-    image.save()
+    image_file, filename, content_sha256 = result
+
+    # Reuse an existing image with identical contents
+    image = Image.objects.filter(content_sha256=content_sha256).first()
+    if image:
+        print(f"  Duplicate of existing image: {image}")
+    else:
+        # Create Image object
+        content_file = File(image_file, name=filename)
+        image = Image(
+            file=content_file,
+            original_name=filename,
+            alt_text=f"Featured image for {post.title}",
+            content_sha256=content_sha256,
+        )
+        image.save()
+        images_by_name[image.original_name] = image
+        print(f"  Created featured image: {filename}")
+    image_file.close()
+    url_cache[image_url] = image
 
     # Set as featured image
     post.featured_image = image
     post.save(update_fields=['featured_image'])
-    print(f"  Created featured image: {filename}")
     return True
 
 
 def main():
     print("Extracting featured images from post content...")
 
-    posts_without_featured = Post.objects.filter(featured_image__isnull=True)
+    posts_without_featured = Post.objects.filter(featured_image__isnull=True).only(
+        'id', 'title', 'slug', 'status', 'published_at', 'content_md', 'content_html', 'featured_image'
+    )
     total = posts_without_featured.count()
 
     print(f"Found {total} posts without featured images")
 
     updated = 0
-    for post in posts_without_featured:
+    url_cache = {}
+    images_by_name = load_images_by_name()
+    for post in posts_without_featured.iterator(chunk_size=100):
         print(f"\nProcessing: {post.title}")
-        if process_post(post):
+        if process_post(post, url_cache, images_by_name):
             updated += 1
         else:
             print("  No image found or could not download")